@@ -0,0 +1,182 @@
+import cProfile
+import json
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+# Capture ids look like "20261018T120000.123456789Z" (UTC, nanosecond precision)
+# so they sort in creation order; anything else is rejected so download
+# requests can never escape the capture directory.
+_CAPTURE_ID_PATTERN = re.compile(r'^\d{8}T\d{6}\.\d{9}Z$')
+
+# Artifact kind -> file suffix written for each capture
+CAPTURE_KINDS = {
+    'cprofile': '.prof',
+    'tracemalloc': '.tracemalloc',
+    'meta': '.json',
+}
+
+# cProfile and tracemalloc are process-wide, so only one capture may run at a time
+_capture_lock = threading.Lock()
+
+_id_lock = threading.Lock()
+_last_capture_ns = 0
+
+
+class CaptureBusy(RuntimeError):
+    """Raised when a capture is requested while another one is running."""
+
+
+def _new_capture_id():
+    """Return a capture id strictly greater than any issued before in this process."""
+    global _last_capture_ns
+    with _id_lock:
+        _last_capture_ns = max(time.time_ns(), _last_capture_ns + 1)
+        ns = _last_capture_ns
+    seconds, nanos = divmod(ns, 10**9)
+    now = datetime.fromtimestamp(seconds, timezone.utc)
+    return f'{now:%Y%m%dT%H%M%S}.{nanos:09d}Z', now.replace(microsecond=nanos // 1000)
+
+
+def capture_dir():
+    """Directory holding profiling captures, created on first use."""
+    path = Path(getattr(settings, 'PROFILE_CAPTURE_DIR', settings.BASE_DIR / 'profiles'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def capture_path(capture_id, kind):
+    """
+    Resolve the on-disk file for one artifact of a capture.
+
+    Returns:
+        Path, or None if the id or kind is invalid or the file does not exist.
+    """
+    if not _CAPTURE_ID_PATTERN.match(capture_id) or kind not in CAPTURE_KINDS:
+        return None
+    path = capture_dir() / f'{capture_id}{CAPTURE_KINDS[kind]}'
+    return path if path.is_file() else None
+
+
+def list_captures():
+    """
+    Return metadata for stored captures, newest first.
+    """
+    captures = []
+    for meta_file in sorted(capture_dir().glob('*.json'), reverse=True):
+        try:
+            captures.append(json.loads(meta_file.read_text(encoding='utf-8')))
+        except (OSError, ValueError):
+            continue
+    return captures
+
+
+def _prune_captures():
+    """Delete the oldest captures beyond PROFILE_CAPTURE_RETENTION."""
+    retention = getattr(settings, 'PROFILE_CAPTURE_RETENTION', 20)
+    capture_ids = sorted(
+        {p.stem for p in capture_dir().iterdir() if _CAPTURE_ID_PATTERN.match(p.stem)},
+        reverse=True,
+    )
+    for capture_id in capture_ids[retention:]:
+        for suffix in CAPTURE_KINDS.values():
+            (capture_dir() / f'{capture_id}{suffix}').unlink(missing_ok=True)
+
+
+class ProfileCapture:
+    """
+    cProfile + tracemalloc capture for a single request.
+
+    Use stage() to time the individual steps being profiled; call save()
+    once the request has been handled to write the artifacts to disk.
+    """
+
+    def __init__(self, label=''):
+        self.capture_id, now = _new_capture_id()
+        self.created_at = now.isoformat()
+        self.label = label
+        self.stages = {}
+        self._profiler = cProfile.Profile()
+        self._snapshot = None
+        self._peak_bytes = 0
+        self._started_tracemalloc = False
+
+    def start(self):
+        if not _capture_lock.acquire(blocking=False):
+            raise CaptureBusy('Another profiling capture is already in progress')
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._profiler.enable()
+        except BaseException:
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            _capture_lock.release()
+            raise
+
+    def stop(self):
+        try:
+            self._profiler.disable()
+            self._snapshot = tracemalloc.take_snapshot()
+            _, self._peak_bytes = tracemalloc.get_traced_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        finally:
+            _capture_lock.release()
+
+    @contextmanager
+    def stage(self, name):
+        """Record wall-clock time (ms) spent in the wrapped block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round((time.perf_counter() - started) * 1000, 3)
+
+    def save(self, status_code=None):
+        """
+        Write the cProfile stats, tracemalloc snapshot and metadata to disk.
+
+        Returns:
+            dict: the metadata stored alongside the capture
+
+        Raises:
+            OSError: if an artifact cannot be written; any partial files are removed
+        """
+        meta = {
+            'id': self.capture_id,
+            'created_at': self.created_at,
+            'label': self.label,
+            'status_code': status_code,
+            'stages_ms': self.stages,
+            'peak_memory_bytes': self._peak_bytes,
+        }
+
+        directory = capture_dir()
+        try:
+            self._profiler.dump_stats(directory / f'{self.capture_id}.prof')
+            self._snapshot.dump(str(directory / f'{self.capture_id}.tracemalloc'))
+            (directory / f'{self.capture_id}.json').write_text(json.dumps(meta), encoding='utf-8')
+        except OSError:
+            for suffix in CAPTURE_KINDS.values():
+                (directory / f'{self.capture_id}{suffix}').unlink(missing_ok=True)
+            raise
+
+        _prune_captures()
+        return meta
+
+
+class NullCapture:
+    """Stand-in used when profiling is not requested; stage() is a no-op."""
+
+    @contextmanager
+    def stage(self, name):
+        yield
@@ -4,4 +4,6 @@ from . import views
 urlpatterns = [
     path('', views.home, name='home'),
     path('extract/', views.extract, name='extract'),
+    path('profiles/', views.profiles, name='profiles'),
+    path('profiles/<str:capture_id>/<str:kind>/', views.profile_download, name='profile_download'),
 ]
\ No newline at end of file
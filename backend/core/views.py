@@ -1,12 +1,22 @@
 from django.shortcuts import render, HttpResponse
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
+from django.http import FileResponse, Http404, JsonResponse
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.decorators.http import require_http_methods
 from datetime import datetime
 import json
+import logging
 import re
 import pdfplumber
 from io import BytesIO
+from .profiling import (
+    CaptureBusy,
+    NullCapture,
+    ProfileCapture,
+    capture_path,
+    list_captures,
+)
+
+logger = logging.getLogger(__name__)
 
 # Reusable regex building blocks
 _MONTHS = r'(?:January|February|March|April|May|June|July|August|September|October|November|December)'
@@ -138,6 +148,46 @@ def extract_values_from_text(text):
 @csrf_exempt
 @require_http_methods(["POST"])
 def extract(request):
+    if request.POST.get('profile') not in ('1', 'true'):
+        return _extract(request, NullCapture())
+    return _profiled_extract(request)
+
+
+@csrf_protect
+def _profiled_extract(request):
+    """
+    Run _extract() under a ProfileCapture and store the result.
+
+    Unlike plain extraction this is CSRF-protected: the staff check relies on
+    the session cookie, so a cross-site post must not be able to trigger it.
+    """
+    # Profiling captures are admin-only
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Profiling requires an admin account'}, status=403)
+
+    label = request.FILES['file'].name if 'file' in request.FILES else ''
+    capture = ProfileCapture(label=label)
+    try:
+        capture.start()
+    except CaptureBusy as e:
+        return JsonResponse({'error': str(e)}, status=409)
+
+    try:
+        response = _extract(request, capture)
+    finally:
+        capture.stop()
+
+    try:
+        capture.save(status_code=response.status_code)
+    except OSError:
+        logger.exception('Could not save profiling capture %s', capture.capture_id)
+        return response
+
+    response['X-Profile-Capture'] = capture.capture_id
+    return response
+
+
+def _extract(request, capture):
     try:
         if 'file' not in request.FILES:
             return JsonResponse({'error': 'No file uploaded'}, status=400)
@@ -153,9 +203,12 @@ def extract(request):
         # Get optional period_end_date parameter
         requested_period_end_date = request.POST.get('period_end_date')
         
-        pdf_text = pdf_to_text(uploaded_file)
+        with capture.stage('pdf_to_text'):
+            pdf_text = pdf_to_text(uploaded_file)
 
-        values = extract_values_from_text(pdf_text)
+        with capture.stage('regex'):
+            values = extract_values_from_text(pdf_text)
+            header = _parse_year_header(pdf_text)
 
         if not values:
             return JsonResponse({'error': 'Could not extract financial data from PDF'}, status=400)
@@ -174,7 +227,6 @@ def extract(request):
         year, revenue, cost = selected_data
 
         # Build period_end_date from the actual month/day in the document
-        header = _parse_year_header(pdf_text)
         if header:
             period_string, _ = header  # e.g. "December 31,"
             period_date = datetime.strptime(period_string.rstrip(',').strip(), "%B %d")
@@ -190,8 +242,33 @@ def extract(request):
             }
         }
 
-        return JsonResponse(response_data)
+        with capture.stage('serialization'):
+            response = JsonResponse(response_data)
+
+        return response
 
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
-        
\ No newline at end of file
+
+
+@require_http_methods(["GET"])
+def profiles(request):
+    """List stored profiling captures (admin only)."""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Profiling requires an admin account'}, status=403)
+    return JsonResponse({'captures': list_captures()})
+
+
+@require_http_methods(["GET"])
+def profile_download(request, capture_id, kind):
+    """
+    Download one artifact of a capture (admin only).
+
+    kind is "cprofile" (pstats dump), "tracemalloc" (snapshot dump) or "meta".
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Profiling requires an admin account'}, status=403)
+    path = capture_path(capture_id, kind)
+    if path is None:
+        raise Http404('Capture not found')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name)
@@ -145,4 +145,6 @@ FILE_UPLOAD_PERMISSIONS = 0o644
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
-
+# Per-request profiling captures (see core/profiling.py)
+PROFILE_CAPTURE_DIR = BASE_DIR / 'profiles'
+PROFILE_CAPTURE_RETENTION = 20  # oldest captures beyond this count are deleted
@@ -0,0 +1,127 @@
+import os
+import tracemalloc
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from core.profiling import ProfileCapture
+
+
+@pytest.mark.django_db
+class TestProfilingCapture:
+
+    @pytest.fixture(autouse=True)
+    def capture_settings(self, settings, tmp_path):
+        settings.PROFILE_CAPTURE_DIR = tmp_path / 'profiles'
+        settings.PROFILE_CAPTURE_RETENTION = 2
+
+    @pytest.fixture
+    def admin_client(self, client):
+        user = User.objects.create_user('admin', password='pw', is_staff=True)
+        client.force_login(user)
+        return client
+
+    def _upload(self):
+        return SimpleUploadedFile('filing.pdf', b'not really a pdf', content_type='application/pdf')
+
+    def test_profile_flag_requires_admin(self, client):
+        response = client.post('/api/extract/', {'file': self._upload(), 'profile': '1'})
+
+        assert response.status_code == 403
+
+    def test_extract_without_flag_is_not_profiled(self, admin_client):
+        response = admin_client.post('/api/extract/', {'file': self._upload()})
+
+        assert 'X-Profile-Capture' not in response
+        assert admin_client.get('/api/profiles/').json()['captures'] == []
+
+    def test_profiled_extract_stores_capture(self, admin_client):
+        response = admin_client.post('/api/extract/', {'file': self._upload(), 'profile': '1'})
+        capture_id = response['X-Profile-Capture']
+
+        captures = admin_client.get('/api/profiles/').json()['captures']
+        assert len(captures) == 1
+        assert captures[0]['id'] == capture_id
+        assert captures[0]['label'] == 'filing.pdf'
+        assert captures[0]['status_code'] == response.status_code
+        assert 'pdf_to_text' in captures[0]['stages_ms']
+        assert 'regex' in captures[0]['stages_ms']
+
+        for kind in ('cprofile', 'tracemalloc', 'meta'):
+            download = admin_client.get(f'/api/profiles/{capture_id}/{kind}/')
+            assert download.status_code == 200
+            assert b''.join(download.streaming_content)
+
+    def test_successful_profiled_extract_times_serialization(self, admin_client, monkeypatch):
+        test_file_path = os.path.join(os.path.dirname(__file__), 'extracted_text.txt')
+        with open(test_file_path, 'r', encoding='utf-8') as file:
+            sample_text = file.read()
+        monkeypatch.setattr('core.views.pdf_to_text', lambda pdf_file: sample_text)
+
+        response = admin_client.post('/api/extract/', {'file': self._upload(), 'profile': '1'})
+
+        assert response.status_code == 200
+        assert response.json()['results'] == {'revenue': '350018', 'cos': '146306'}
+        capture = admin_client.get('/api/profiles/').json()['captures'][0]
+        assert capture['id'] == response['X-Profile-Capture']
+        assert capture['status_code'] == 200
+        assert set(capture['stages_ms']) == {'pdf_to_text', 'regex', 'serialization'}
+
+    def test_retention_limit_prunes_oldest(self, admin_client):
+        ids = []
+        for _ in range(3):
+            response = admin_client.post('/api/extract/', {'file': self._upload(), 'profile': '1'})
+            ids.append(response['X-Profile-Capture'])
+
+        stored = [c['id'] for c in admin_client.get('/api/profiles/').json()['captures']]
+        assert len(stored) == 2
+        assert stored == list(reversed(ids[-2:]))  # newest first
+
+    def test_download_rejects_unknown_capture(self, admin_client):
+        assert admin_client.get('/api/profiles/..%2Fdb/cprofile/').status_code == 404
+        assert admin_client.get('/api/profiles/20260101T000000.000000000Z/cprofile/').status_code == 404
+
+    def test_listing_requires_admin(self, client):
+        assert client.get('/api/profiles/').status_code == 403
+
+    def test_failed_save_returns_extraction_without_capture(self, admin_client, settings, monkeypatch):
+        def fail_dump(snapshot, filename):
+            raise OSError('disk full')
+
+        monkeypatch.setattr(tracemalloc.Snapshot, 'dump', fail_dump)
+        response = admin_client.post('/api/extract/', {'file': self._upload(), 'profile': '1'})
+
+        assert response.status_code == 400
+        assert 'X-Profile-Capture' not in response
+        assert list(settings.PROFILE_CAPTURE_DIR.iterdir()) == []
+
+    def test_failed_start_releases_lock(self, admin_client, monkeypatch):
+        def fail_reset_peak():
+            raise RuntimeError('tracemalloc unavailable')
+
+        with monkeypatch.context() as patched:
+            patched.setattr(tracemalloc, 'reset_peak', fail_reset_peak)
+            with pytest.raises(RuntimeError):
+                ProfileCapture().start()
+
+        assert not tracemalloc.is_tracing()
+        response = admin_client.post('/api/extract/', {'file': self._upload(), 'profile': '1'})
+        assert 'X-Profile-Capture' in response
+
+    def test_profile_flag_requires_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(User.objects.create_user('admin', password='pw', is_staff=True))
+
+        response = client.post('/api/extract/', {'file': self._upload(), 'profile': '1'})
+
+        assert response.status_code == 403
+        assert 'X-Profile-Capture' not in response
+
+    def test_extract_without_flag_skips_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+
+        response = client.post('/api/extract/', {'file': self._upload()})
+
+        assert response.status_code == 400